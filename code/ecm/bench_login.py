@@ -0,0 +1,75 @@
+"""
+Login throughput benchmark.
+
+    python bench_login.py --email admin@example.com --password secret \
+        --concurrency 50 --requests 1000
+
+Fires concurrent POST /auth/login requests at a running server and reports
+logins per second and latency percentiles. Compare runs with different
+PASSWORD_HASH_WORKERS / PASSWORD_HASH_QUEUE_TIMEOUT settings; 503s mean
+the hashing pool shed load.
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+async def run(args):
+    latencies = []
+    statuses = Counter()
+    remaining = iter(range(args.requests))
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    res = await client.post(
+                        "/auth/login",
+                        data={"username": args.email, "password": args.password}
+                    )
+                    statuses[res.status_code] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ok = statuses.get(200, 0)
+    print(f"requests:     {args.requests} at concurrency {args.concurrency}")
+    print(f"elapsed:      {elapsed:.2f}s")
+    print(f"logins/sec:   {ok / elapsed:.1f}")
+    print(f"p50 latency:  {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"p95 latency:  {percentile(latencies, 95) * 1000:.1f} ms")
+    print(f"p99 latency:  {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"status codes: {dict(statuses)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark POST /auth/login")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=30)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
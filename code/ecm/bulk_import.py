@@ -0,0 +1,85 @@
+"""
+Bulk import a directory or ZIP archive from the command line.
+
+    python bulk_import.py /srv/scans --email admin@example.com
+    python bulk_import.py archive.zip --email admin@example.com --category Policy
+    python bulk_import.py --resume 12
+
+Runs in-process with the same pipeline as POST /documents/bulk-import, so
+progress is recorded in bulk_import_runs and an interrupted import can be
+picked up again with --resume.
+"""
+import argparse
+import os
+import sys
+import zipfile
+
+
+def main():
+    # Imported here, not at module level: OCR worker processes are spawned
+    # and re-import this script, and must not load the app, models and DB
+    from main import SessionLocal, BulkImportRun, run_bulk_import
+
+    parser = argparse.ArgumentParser(description="Bulk import documents into the ECM")
+    parser.add_argument("source", nargs="?", help="directory or .zip file to import")
+    parser.add_argument("--email", help="uploader email recorded on every document")
+    parser.add_argument("--category", default="Auto", help='category, or "Auto" to classify')
+    parser.add_argument("--document-type", default="Public")
+    parser.add_argument("--year", type=int, default=None, help="year approved")
+    parser.add_argument("--resume", type=int, metavar="RUN_ID", help="resume an interrupted run")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.resume:
+            run = db.query(BulkImportRun).filter(BulkImportRun.id == args.resume).first()
+            if not run:
+                sys.exit(f"Bulk import {args.resume} not found")
+            if run.status == "DONE":
+                sys.exit(f"Bulk import {run.id} already finished")
+            run.status = "QUEUED"
+            run.error = None
+
+        else:
+            if not args.source or not args.email:
+                parser.error("source and --email are required unless --resume is given")
+
+            source = os.path.abspath(args.source)
+            if os.path.isdir(source):
+                source_type = "DIRECTORY"
+            elif zipfile.is_zipfile(source):
+                source_type = "ZIP"
+            else:
+                sys.exit(f"{args.source} is neither a directory nor a ZIP archive")
+
+            run = BulkImportRun(
+                source=source,
+                source_type=source_type,
+                category=args.category,
+                document_type=args.document_type,
+                year_approved=args.year,
+                created_by=args.email
+            )
+            db.add(run)
+
+        db.commit()
+        run_id = run.id
+    finally:
+        db.close()
+
+    print(f"Bulk import {run_id} running...")
+    run_bulk_import(run_id)
+
+    db = SessionLocal()
+    try:
+        run = db.query(BulkImportRun).filter(BulkImportRun.id == run_id).first()
+        print(
+            f"Bulk import {run.id}: {run.status} - {run.imported} imported, "
+            f"{run.duplicates} duplicates, {run.failed} failed of {run.total}"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class TimedPoolMixin:
+    """
+    Records how long each connection checkout waits in the pool, so pool
+    exhaustion shows up as latency in /admin/metrics instead of as
+    unexplained request stalls.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._timing_lock = threading.Lock()
+        self._checkouts = 0
+        self._errors = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent = deque(maxlen=1000)   # last checkout waits, for percentiles
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._timing_lock:
+                self._errors += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._timing_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+                self._recent.append(waited)
+
+    def checkout_stats(self):
+        with self._timing_lock:
+            recent = sorted(self._recent)
+            p95 = recent[int(len(recent) * 0.95) - 1] if recent else 0.0
+            return {
+                "checkouts": self._checkouts,
+                "checkout_errors": self._errors,
+                "checkout_wait_avg_ms": round(self._wait_total / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                "checkout_wait_p95_ms": round(p95 * 1000, 3),
+                "checkout_wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool):
+    stats = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "in_use": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+        })
+
+    if isinstance(pool, TimedPoolMixin):
+        stats.update(pool.checkout_stats())
+
+    return stats
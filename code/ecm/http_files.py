@@ -0,0 +1,149 @@
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+
+CHUNK_SIZE = 256 * 1024
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single ``bytes=`` range against a file of ``size`` bytes.
+
+    Returns (start, end) inclusive, "unsatisfiable", or None when the
+    header should be ignored (absent, malformed or multi-range) and the
+    whole file served.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+
+    start, _, end = header[len("bytes="):].strip().partition("-")
+    try:
+        if start == "":
+            # Suffix range: the last N bytes
+            length = int(end)
+            if length <= 0:
+                return "unsatisfiable"
+            return max(size - length, 0), size - 1
+
+        start = int(start)
+        end = int(end) if end else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, min(end, size - 1)
+
+
+def is_continuation(request: Request):
+    """True for a Range request that does not start at byte 0 (viewer paging, resumed download)."""
+    header = request.headers.get("range", "")
+    return header.startswith("bytes=") and not header[len("bytes="):].strip().startswith("0-")
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def sends_body(request: Request, etag: str, last_modified: datetime):
+    """False when file_response would answer without a body (HEAD or 304)."""
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return request.method != "HEAD" and not _not_modified(request, etag, last_modified)
+
+
+def _iter_file(path: str, start: int, length: int, on_sent=None):
+    sent = 0
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            while length > 0:
+                chunk = f.read(min(CHUNK_SIZE, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+                sent += len(chunk)
+    finally:
+        # Also runs when the client disconnects and the generator is closed
+        if on_sent is not None:
+            on_sent(start, sent)
+
+
+def file_response(request: Request, path: str, etag: str, last_modified: datetime,
+                  media_type: str, cache_control: str, headers: dict | None = None,
+                  on_sent=None):
+    """
+    Serve ``path`` with validators and byte-range support.
+
+    ``etag`` must be a quoted strong tag that changes with the content
+    (the content hash). Answers 304 to a matching If-None-Match /
+    If-Modified-Since, 206 to a satisfiable single Range (honouring
+    If-Range), 416 to an unsatisfiable one, and 200 otherwise.
+
+    ``on_sent(start, bytes_sent)`` is called once a body stops streaming,
+    whether it completed or the client went away.
+    """
+    size = os.path.getsize(path)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    base = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        **(headers or {}),
+    }
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers={
+            k: v for k, v in base.items() if k in ("ETag", "Last-Modified", "Cache-Control")
+        })
+
+    byte_range = parse_range(request.headers.get("range"), size)
+
+    # A stale If-Range means the client's partial copy is outdated: send it all
+    if_range = request.headers.get("if-range")
+    if byte_range is not None and if_range and if_range != etag:
+        byte_range = None
+
+    if byte_range == "unsatisfiable":
+        return Response(status_code=416, headers={**base, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        (start, end), status = byte_range, 206
+        base["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1 if size else 0
+    base["Content-Length"] = str(length)
+
+    if request.method == "HEAD":
+        return Response(status_code=status, headers=base, media_type=media_type)
+
+    return StreamingResponse(
+        _iter_file(path, start, length, on_sent),
+        status_code=status,
+        headers=base,
+        media_type=media_type
+    )
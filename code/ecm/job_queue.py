@@ -0,0 +1,97 @@
+import queue
+import threading
+import traceback
+
+
+class JobQueue:
+    """
+    Local background job runner: an in-process queue drained by a pool of
+    worker threads, no external broker.
+
+    Only job ids travel through the queue; the job state itself is
+    persisted by ``handler`` (see ``IngestJob`` in main.py), so queued work
+    survives a restart by simply re-submitting the pending ids.
+
+    ``handler(job_id)`` raising an exception counts as a failed attempt.
+    The job is retried after ``retry_delay * 2 ** (attempt - 1)`` seconds
+    until ``max_retries`` attempts have been made; ``on_error(job_id,
+    attempt, exc, will_retry)`` is called after every failure.
+
+    ``reap()``, when given, is polled every ``reap_interval`` seconds and
+    returns ids of persisted jobs to submit again, e.g. jobs whose worker
+    process died mid-run.
+    """
+
+    def __init__(self, handler, workers: int = 2, max_retries: int = 3,
+                 retry_delay: float = 10, on_error=None, name: str = "jobs",
+                 reap=None, reap_interval: float = 60):
+        self.handler = handler
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_error = on_error
+        self.name = name
+        self.reap = reap
+        self.reap_interval = reap_interval
+
+        self._queue = queue.Queue()
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+        if self.reap is not None:
+            t = threading.Thread(target=self._reap_loop, name=f"{self.name}-reaper", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def submit(self, job_id, attempt: int = 1):
+        self._queue.put((job_id, attempt))
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def _work(self):
+        while not self._stopping.is_set():
+            item = self._queue.get()
+            if item is None:
+                break
+
+            job_id, attempt = item
+            try:
+                self.handler(job_id)
+            except Exception as exc:
+                traceback.print_exc()
+                will_retry = attempt < self.max_retries and not self._stopping.is_set()
+
+                if self.on_error:
+                    try:
+                        self.on_error(job_id, attempt, exc, will_retry)
+                    except Exception:
+                        traceback.print_exc()
+
+                if will_retry:
+                    delay = self.retry_delay * 2 ** (attempt - 1)
+                    timer = threading.Timer(delay, self.submit, args=(job_id, attempt + 1))
+                    timer.daemon = True
+                    timer.start()
+
+    def _reap_loop(self):
+        while not self._stopping.wait(self.reap_interval):
+            try:
+                for job_id in self.reap():
+                    self.submit(job_id)
+            except Exception:
+                traceback.print_exc()
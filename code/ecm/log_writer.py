@@ -0,0 +1,116 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class BufferedLogWriter:
+    """
+    Collects log rows in memory and hands them to ``flush_fn(rows)`` in
+    batches from a background thread, so request handlers never wait on a
+    write transaction.
+
+    A batch is flushed once ``batch_size`` rows are waiting or
+    ``flush_interval`` seconds after the previous flush, and once more on
+    ``stop()``. At most ``max_buffer`` rows are held: beyond that, and for
+    batches that still fail after being retried once, rows are dropped and
+    counted rather than growing memory without bound.
+    """
+
+    def __init__(self, flush_fn, batch_size: int = 500, flush_interval: float = 2.0,
+                 max_buffer: int = 50000, name: str = "log-writer"):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.name = name
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+
+        self._written = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def write(self, row: dict):
+        with self._cond:
+            if len(self._buffer) >= self.max_buffer:
+                self._dropped += 1
+                return
+
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def depth(self):
+        return len(self._buffer)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "depth": len(self._buffer),
+                "max_buffer": self.max_buffer,
+                "written": self._written,
+                "dropped": self._dropped,
+                "flushes": self._flushes,
+                "failed_flushes": self._failed_flushes,
+            }
+
+    def _take(self):
+        with self._cond:
+            count = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                stopping = self._stopping
+
+            # Drain everything on shutdown, one batch per tick otherwise
+            while True:
+                batch = self._take()
+                if batch:
+                    self._flush(batch)
+                if not stopping or not batch:
+                    break
+
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        for attempt in (1, 2):
+            try:
+                self.flush_fn(batch)
+            except Exception:
+                traceback.print_exc()
+                with self._cond:
+                    self._failed_flushes += 1
+                if attempt == 1:
+                    time.sleep(min(self.flush_interval, 1.0))
+                continue
+
+            with self._cond:
+                self._written += len(batch)
+                self._flushes += 1
+            return
+
+        with self._cond:
+            self._dropped += len(batch)
@@ -0,0 +1,278 @@
+"""Baseline: the schema create_all() and add_missing_columns() used to build
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Tables are frozen here as they stood when migrations were introduced. A
+missing table is created; on an existing table only missing columns and
+indexes are added, so databases built by the startup DDL (in any state)
+land on the same schema. Runs under the migration lock in env.py, so
+workers no longer race each other's CREATE TABLE.
+
+Later changes belong in their own revisions, never here.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+metadata = sa.MetaData()
+
+LONGBLOB = sa.LargeBinary(length=2**32 - 1)
+
+sa.Table(
+    "users", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("first_name", sa.String(255)),
+    sa.Column("middle_name", sa.String(255)),
+    sa.Column("last_name", sa.String(255)),
+    sa.Column("suffix", sa.String(50), nullable=True),
+    sa.Column("position", sa.String(255)),
+    sa.Column("office", sa.String(255)),
+    sa.Column("email", sa.String(255), unique=True, index=True),
+    sa.Column("password", sa.String(255)),
+    sa.Column("role", sa.String(50)),
+    sa.Column("is_active", sa.Boolean),
+    sa.Column("created_at", sa.DateTime),
+)
+
+# category_key and the filter indexes come with 0002
+sa.Table(
+    "documents", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("filename", sa.String(255)),
+    sa.Column("filepath", sa.String(500)),
+    sa.Column("description", sa.Text),
+    sa.Column("category", sa.String(100)),
+    sa.Column("year_approved", sa.Integer, nullable=True),
+    sa.Column("document_type", sa.String(50)),
+    sa.Column("uploaded_by", sa.String(255)),
+    sa.Column("uploaded_at", sa.DateTime),
+    sa.Column("embedding", sa.JSON),
+    sa.Column("content_hash", sa.String(64), nullable=True, index=True),
+    sa.Column("file_size", sa.BigInteger, nullable=True),
+    sa.Index("ix_documents_uploaded_at_id", "uploaded_at", "id"),
+    sa.Index("ix_documents_uploaded_by_uploaded_at_id", "uploaded_by", "uploaded_at", "id"),
+)
+
+sa.Table(
+    "content_blobs", metadata,
+    sa.Column("content_hash", sa.String(64), primary_key=True),
+    sa.Column("filepath", sa.String(500)),
+    sa.Column("file_size", sa.BigInteger),
+    sa.Column("auto_category", sa.String(100), nullable=True),
+    sa.Column("created_at", sa.DateTime),
+)
+
+sa.Table(
+    "document_embeddings", metadata,
+    sa.Column("document_id", sa.Integer, primary_key=True),
+    sa.Column("model", sa.String(100), primary_key=True),
+    sa.Column("content_hash", sa.String(64), nullable=True),
+    sa.Column("dtype", sa.String(10)),
+    sa.Column("dim", sa.Integer),
+    sa.Column("scale", sa.Float, nullable=True),
+    sa.Column("vector", sa.LargeBinary),
+    sa.Index("ux_document_embeddings_hash_model", "content_hash", "model", unique=True),
+)
+
+sa.Table(
+    "document_texts", metadata,
+    sa.Column("document_id", sa.Integer, primary_key=True),
+    sa.Column("content_hash", sa.String(64), nullable=True, unique=True),
+    sa.Column("method", sa.String(20)),
+    sa.Column("page_offsets", sa.JSON),
+    sa.Column("char_count", sa.Integer),
+    sa.Column("content", LONGBLOB),
+    sa.Column("extracted_at", sa.DateTime),
+)
+
+sa.Table(
+    "document_sentences", metadata,
+    sa.Column("document_id", sa.Integer, primary_key=True),
+    sa.Column("model", sa.String(100), primary_key=True),
+    sa.Column("content_hash", sa.String(64), nullable=True),
+    sa.Column("sentences", sa.JSON),
+    sa.Column("dtype", sa.String(10)),
+    sa.Column("dim", sa.Integer),
+    sa.Column("scale", sa.Float, nullable=True),
+    sa.Column("vectors", LONGBLOB),
+    sa.Index("ux_document_sentences_hash_model", "content_hash", "model", unique=True),
+)
+
+sa.Table(
+    "positions", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("name", sa.String(255), unique=True, nullable=False),
+)
+
+sa.Table(
+    "offices", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("office_code", sa.String(50), unique=True, nullable=False, index=True),
+    sa.Column("name", sa.String(255), unique=True, nullable=False),
+)
+
+sa.Table(
+    "document_logs", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("document_id", sa.Integer, index=True),
+    sa.Column("user_email", sa.String(255)),
+    sa.Column("action", sa.String(50)),
+    sa.Column("source", sa.String(50)),
+    sa.Column("accessed_at", sa.DateTime),
+    sa.Index("ix_document_logs_accessed_at_id", "accessed_at", "id"),
+    sa.Index("ix_document_logs_user_accessed_at", "user_email", "accessed_at", "id"),
+    sa.Index("ix_document_logs_document_accessed_at", "document_id", "accessed_at", "id"),
+    sa.Index("ix_document_logs_action_accessed_at", "action", "accessed_at", "id"),
+)
+
+sa.Table(
+    "document_logs_archive", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=False),
+    sa.Column("document_id", sa.Integer),
+    sa.Column("user_email", sa.String(255)),
+    sa.Column("action", sa.String(50)),
+    sa.Column("source", sa.String(50)),
+    sa.Column("accessed_at", sa.DateTime),
+    sa.Index("ix_document_logs_archive_accessed_at_id", "accessed_at", "id"),
+    sa.Index("ix_document_logs_archive_user_accessed_at", "user_email", "accessed_at", "id"),
+    sa.Index("ix_document_logs_archive_document_accessed_at", "document_id", "accessed_at", "id"),
+)
+
+sa.Table(
+    "document_access_daily", metadata,
+    sa.Column("day", sa.Date, primary_key=True),
+    sa.Column("document_id", sa.Integer, primary_key=True),
+    sa.Column("action", sa.String(50), primary_key=True),
+    sa.Column("count", sa.BigInteger),
+)
+
+sa.Table(
+    "access_daily", metadata,
+    sa.Column("day", sa.Date, primary_key=True),
+    sa.Column("action", sa.String(50), primary_key=True),
+    sa.Column("count", sa.BigInteger),
+)
+
+sa.Table(
+    "office_access_daily", metadata,
+    sa.Column("day", sa.Date, primary_key=True),
+    sa.Column("office", sa.String(255), primary_key=True),
+    sa.Column("action", sa.String(50), primary_key=True),
+    sa.Column("count", sa.BigInteger),
+)
+
+# The approval indexes come with 0002, served_bytes with 0005
+sa.Table(
+    "download_requests", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("document_id", sa.Integer, index=True),
+    sa.Column("document_name", sa.String(255)),
+    sa.Column("requester_email", sa.String(255)),
+    sa.Column("reason", sa.Text, nullable=True),
+    sa.Column("status", sa.String(20)),
+    sa.Column("requested_at", sa.DateTime),
+    sa.Column("downloaded_at", sa.DateTime, nullable=True),
+)
+
+sa.Table(
+    "ingest_jobs", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("document_id", sa.Integer, index=True),
+    sa.Column("status", sa.String(20), index=True),
+    sa.Column("classify", sa.Boolean),
+    sa.Column("attempts", sa.Integer),
+    sa.Column("error", sa.Text, nullable=True),
+    sa.Column("created_by", sa.String(255)),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("started_at", sa.DateTime, nullable=True),
+    sa.Column("finished_at", sa.DateTime, nullable=True),
+)
+
+# beat_us comes with 0005
+sa.Table(
+    "replica_heartbeat", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, autoincrement=False),
+    sa.Column("beat_at", sa.DateTime),
+)
+
+sa.Table(
+    "reindex_runs", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("model", sa.String(100)),
+    sa.Column("window", sa.Integer),
+    sa.Column("version", sa.String(100), index=True),
+    sa.Column("status", sa.String(20), index=True),
+    sa.Column("last_document_id", sa.Integer),
+    sa.Column("processed", sa.Integer),
+    sa.Column("total", sa.Integer),
+    sa.Column("error", sa.Text, nullable=True),
+    sa.Column("created_by", sa.String(255)),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("started_at", sa.DateTime, nullable=True),
+    sa.Column("updated_at", sa.DateTime, nullable=True),
+    sa.Column("finished_at", sa.DateTime, nullable=True),
+)
+
+sa.Table(
+    "bulk_import_runs", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("source", sa.String(1000)),
+    sa.Column("source_type", sa.String(20)),
+    sa.Column("status", sa.String(20), index=True),
+    sa.Column("category", sa.String(100)),
+    sa.Column("document_type", sa.String(50)),
+    sa.Column("year_approved", sa.Integer, nullable=True),
+    sa.Column("created_by", sa.String(255)),
+    sa.Column("total", sa.Integer),
+    sa.Column("imported", sa.Integer),
+    sa.Column("duplicates", sa.Integer),
+    sa.Column("failed", sa.Integer),
+    sa.Column("error", sa.Text, nullable=True),
+    sa.Column("created_at", sa.DateTime),
+    sa.Column("started_at", sa.DateTime, nullable=True),
+    sa.Column("updated_at", sa.DateTime, nullable=True),
+    sa.Column("finished_at", sa.DateTime, nullable=True),
+)
+
+sa.Table(
+    "bulk_import_items", metadata,
+    sa.Column("id", sa.Integer, primary_key=True, index=True),
+    sa.Column("run_id", sa.Integer),
+    sa.Column("path", sa.String(500)),
+    sa.Column("status", sa.String(20)),
+    sa.Column("document_id", sa.Integer, nullable=True),
+    sa.Column("error", sa.Text, nullable=True),
+    sa.Index("ux_bulk_import_items_run_path", "run_id", "path", unique=True),
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    for table in metadata.sorted_tables:
+        inspector = sa.inspect(conn)
+
+        if not inspector.has_table(table.name):
+            table.create(conn)
+            continue
+
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                op.add_column(table.name, sa.Column(column.name, column.type, nullable=True))
+
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(conn)
+
+
+def downgrade():
+    pass
@@ -0,0 +1,62 @@
+"""Normalized category column and composite indexes for hot filters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+- documents.category_key holds lower(trim(category)), so the search
+  category filter compares an indexed column instead of an expression.
+- documents (document_type, uploaded_at, id) serves the Viewer listing.
+- download_requests (document_id, requester_email, status, downloaded_at)
+  serves the approval check on every Viewer download.
+
+Earlier builds created the column and indexes on startup, so each step
+checks first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_documents_document_type_uploaded_at_id", "documents", ["document_type", "uploaded_at", "id"]),
+    ("ix_documents_category_key_year_approved", "documents", ["category_key", "year_approved"]),
+    ("ix_download_requests_approval", "download_requests",
+     ["document_id", "requester_email", "status", "downloaded_at"]),
+    ("ix_download_requests_requester_requested_at", "download_requests", ["requester_email", "requested_at"]),
+]
+
+
+def _columns(table):
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    return {i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    if "category_key" not in _columns("documents"):
+        op.add_column("documents", sa.Column("category_key", sa.String(100), nullable=True))
+
+    op.execute(
+        "UPDATE documents SET category_key = LOWER(TRIM(category)) "
+        "WHERE category IS NOT NULL AND (category_key IS NULL OR category_key <> LOWER(TRIM(category)))"
+    )
+
+    for name, table, columns in INDEXES:
+        if name not in _indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        if name in _indexes(table):
+            op.drop_index(name, table_name=table)
+
+    if "category_key" in _columns("documents"):
+        op.drop_column("documents", "category_key")
@@ -0,0 +1,186 @@
+"""Content-hash legacy documents and move JSON embeddings to packed rows
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Used to run in a startup hook of every worker at once, which could insert
+the same document_embeddings rows twice. Safe to interrupt: hashing only
+touches rows still missing a hash, and JSON embeddings are cleared batch
+by batch as they are moved.
+"""
+import os
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from storage import hash_file
+from vector_index import pack_embedding
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+# The JSON column was only ever written by the original model and window
+LEGACY_EMBEDDING_VERSION = "all-MiniLM-L6-v2"
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float16")
+
+documents = sa.table(
+    "documents",
+    sa.column("id", sa.Integer),
+    sa.column("filepath", sa.String),
+    sa.column("content_hash", sa.String),
+    sa.column("file_size", sa.BigInteger),
+    sa.column("embedding", sa.JSON),
+)
+content_blobs = sa.table(
+    "content_blobs",
+    sa.column("content_hash", sa.String),
+    sa.column("filepath", sa.String),
+    sa.column("file_size", sa.BigInteger),
+    sa.column("created_at", sa.DateTime),
+)
+document_embeddings = sa.table(
+    "document_embeddings",
+    sa.column("document_id", sa.Integer),
+    sa.column("model", sa.String),
+    sa.column("content_hash", sa.String),
+    sa.column("dtype", sa.String),
+    sa.column("dim", sa.Integer),
+    sa.column("scale", sa.Float),
+    sa.column("vector", sa.LargeBinary),
+)
+# Derived artifact tables and their key columns besides the hash
+ARTIFACTS = [
+    (document_embeddings, ["model"]),
+    (sa.table("document_sentences", sa.column("document_id"), sa.column("model"), sa.column("content_hash")), ["model"]),
+    (sa.table("document_texts", sa.column("document_id"), sa.column("content_hash")), []),
+]
+
+
+def backfill_content_hashes(conn):
+    """Hash files of documents uploaded before content addressing and register their blobs."""
+    docs = conn.execute(
+        sa.select(documents.c.id, documents.c.filepath).where(documents.c.content_hash == None)
+    ).all()
+
+    hashed = 0
+    for doc_id, filepath in docs:
+        if not filepath or not os.path.exists(filepath):
+            continue
+
+        content_hash, size = hash_file(filepath)
+        conn.execute(
+            documents.update().where(documents.c.id == doc_id)
+            .values(content_hash=content_hash, file_size=size)
+        )
+
+        known = conn.execute(
+            sa.select(content_blobs.c.content_hash).where(content_blobs.c.content_hash == content_hash)
+        ).first()
+        if not known:
+            conn.execute(content_blobs.insert().values(
+                content_hash=content_hash, filepath=filepath, file_size=size, created_at=datetime.utcnow()
+            ))
+        hashed += 1
+
+    if hashed:
+        print("HASHED LEGACY DOCUMENTS:", hashed)
+
+
+def tag_artifacts(conn):
+    """Give artifact rows their document's hash; drop duplicates of the same content."""
+    hashes = dict(conn.execute(sa.select(documents.c.id, documents.c.content_hash)).all())
+
+    for table, extra in ARTIFACTS:
+        extra_cols = [table.c[name] for name in extra]
+        key_cols = [table.c.document_id] + extra_cols
+
+        taken = set(
+            tuple(row) for row in conn.execute(
+                sa.select(table.c.content_hash, *extra_cols).where(table.c.content_hash != None)
+            )
+        )
+
+        for row in conn.execute(sa.select(*key_cols).where(table.c.content_hash == None)).all():
+            content_hash = hashes.get(row[0])
+            if content_hash is None:
+                continue
+
+            match = sa.and_(*[c == v for c, v in zip(key_cols, row)])
+            key = (content_hash, *row[1:])
+
+            if key in taken:
+                # Same content already has this artifact (pre-dedup duplicate upload)
+                conn.execute(table.delete().where(match))
+            else:
+                conn.execute(table.update().where(match).values(content_hash=content_hash))
+                taken.add(key)
+
+
+def migrate_json_embeddings(conn, batch_size: int = 500):
+    """Move legacy documents.embedding JSON lists into document_embeddings."""
+    migrated = 0
+
+    while True:
+        rows = conn.execute(
+            sa.select(documents.c.id, documents.c.content_hash, documents.c.embedding)
+            .where(documents.c.embedding != None)
+            .order_by(documents.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        for doc_id, content_hash, embedding in rows:
+            if not embedding:
+                continue
+
+            # Shared by content hash; legacy rows without a hash match by id
+            owner = (
+                document_embeddings.c.content_hash == content_hash if content_hash
+                else document_embeddings.c.document_id == doc_id
+            )
+            exists = conn.execute(
+                sa.select(document_embeddings.c.document_id).where(
+                    owner, document_embeddings.c.model == LEGACY_EMBEDDING_VERSION
+                )
+            ).first()
+            if exists:
+                continue
+
+            blob, scale = pack_embedding(embedding, EMBEDDING_DTYPE)
+            conn.execute(document_embeddings.insert().values(
+                document_id=doc_id,
+                model=LEGACY_EMBEDDING_VERSION,
+                content_hash=content_hash,
+                dtype=EMBEDDING_DTYPE,
+                dim=len(embedding),
+                scale=scale,
+                vector=blob
+            ))
+
+        conn.execute(
+            documents.update()
+            .where(documents.c.id.in_([doc_id for doc_id, _, _ in rows]))
+            .values(embedding=sa.null())
+        )
+        migrated += len(rows)
+
+    if migrated:
+        print("MIGRATED JSON EMBEDDINGS:", migrated)
+
+
+def upgrade():
+    conn = op.get_bind()
+    backfill_content_hashes(conn)
+    tag_artifacts(conn)
+    migrate_json_embeddings(conn)
+
+
+def downgrade():
+    # Data only; the packed rows and hashes are kept
+    pass
@@ -0,0 +1,56 @@
+"""Count existing access logs into the analytics rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+From here on every audit-log flush bumps the rollups in the same
+transaction as its insert. This counts the history once, before any worker
+starts writing logs, instead of in each worker's startup while siblings
+were already incrementing the same rows.
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+LOGS = """(
+    SELECT document_id, user_email, action, accessed_at FROM document_logs
+    UNION ALL
+    SELECT document_id, user_email, action, accessed_at FROM document_logs_archive
+) AS logs"""
+
+
+def upgrade():
+    for table in ("document_access_daily", "access_daily", "office_access_daily"):
+        op.execute(f"DELETE FROM {table}")
+
+    op.execute(f"""
+        INSERT INTO document_access_daily (day, document_id, action, count)
+        SELECT DATE(accessed_at), document_id, action, COUNT(*)
+        FROM {LOGS}
+        GROUP BY DATE(accessed_at), document_id, action
+    """)
+
+    op.execute(f"""
+        INSERT INTO access_daily (day, action, count)
+        SELECT DATE(accessed_at), action, COUNT(*)
+        FROM {LOGS}
+        GROUP BY DATE(accessed_at), action
+    """)
+
+    # Same office resolution as update_access_rollups()
+    op.execute(f"""
+        INSERT INTO office_access_daily (day, office, action, count)
+        SELECT DATE(logs.accessed_at), COALESCE(NULLIF(users.office, ''), 'UNKNOWN'), logs.action, COUNT(*)
+        FROM {LOGS}
+        LEFT JOIN users ON users.email = logs.user_email
+        GROUP BY DATE(logs.accessed_at), COALESCE(NULLIF(users.office, ''), 'UNKNOWN'), logs.action
+    """)
+
+
+def downgrade():
+    pass
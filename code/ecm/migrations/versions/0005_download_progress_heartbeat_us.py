@@ -0,0 +1,42 @@
+"""Resume offset for one-time downloads and exact replica heartbeat times
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+- download_requests.served_bytes: how far an approved one-time download
+  got, so a Viewer may resume it from there.
+- replica_heartbeat.beat_us: microseconds since epoch; DATETIME columns
+  may drop the fraction the lag check needs.
+
+Earlier builds added both columns on startup, so each step checks first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("download_requests", "served_bytes"),
+    ("replica_heartbeat", "beat_us"),
+]
+
+
+def _columns(table):
+    return {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    for table, column in COLUMNS:
+        if column not in _columns(table):
+            op.add_column(table, sa.Column(column, sa.BigInteger, nullable=True))
+
+
+def downgrade():
+    for table, column in reversed(COLUMNS):
+        if column in _columns(table):
+            op.drop_column(table, column)
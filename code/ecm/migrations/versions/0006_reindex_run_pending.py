@@ -0,0 +1,68 @@
+"""One open reindex run per embedding version
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Workers starting together each saw no open run for a changed
+EMBEDDING_MODEL / EMBEDDING_WINDOW and queued their own. reindex_runs.pending
+is 1 while a run is QUEUED or RUNNING and NULL afterwards; a unique
+(version, pending) index lets only one open run exist per version.
+
+Duplicates created before this revision are closed as FAILED, keeping the
+oldest open run of each version.
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+reindex_runs = sa.table(
+    "reindex_runs",
+    sa.column("id", sa.Integer),
+    sa.column("version", sa.String),
+    sa.column("status", sa.String),
+    sa.column("error", sa.Text),
+    sa.column("finished_at", sa.DateTime),
+    sa.column("pending", sa.Boolean),
+)
+
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "pending" not in {c["name"] for c in inspector.get_columns("reindex_runs")}:
+        op.add_column("reindex_runs", sa.Column("pending", sa.Boolean, nullable=True))
+
+    kept = {}
+    for run_id, version in conn.execute(
+        sa.select(reindex_runs.c.id, reindex_runs.c.version)
+        .where(reindex_runs.c.status.in_(["QUEUED", "RUNNING"]))
+        .order_by(reindex_runs.c.id)
+    ).all():
+        if version not in kept:
+            kept[version] = run_id
+            values = {"pending": True}
+        else:
+            values = {
+                "status": "FAILED",
+                "pending": None,
+                "error": f"Duplicate of reindex run {kept[version]}",
+                "finished_at": datetime.utcnow(),
+            }
+        conn.execute(reindex_runs.update().where(reindex_runs.c.id == run_id).values(**values))
+
+    if "ux_reindex_runs_version_pending" not in {i["name"] for i in inspector.get_indexes("reindex_runs")}:
+        op.create_index("ux_reindex_runs_version_pending", "reindex_runs", ["version", "pending"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ux_reindex_runs_version_pending", table_name="reindex_runs")
+    op.drop_column("reindex_runs", "pending")
@@ -2,49 +2,75 @@ import fitz  # PyMuPDF
 import docx
 import pytesseract
 from PIL import Image
-import io
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import spacy
+from ocr_utils import ocr_pdf_pages
 
-def extract_text_from_file(filepath: str):
+def extract_text_with_meta(filepath: str):
+    """
+    Extract text and describe how it was obtained.
+
+    Returns ``(text, method, page_offsets)`` where ``page_offsets[i]`` is the
+    character offset at which page ``i`` starts (a single ``[0]`` for
+    non-paginated formats).
+    """
     # PDF
     if filepath.lower().endswith(".pdf"):
         doc = fitz.open(filepath)
-        text = ""
+        pages = []
+        scanned = []
 
         for page in doc:
             # Try normal text extraction first
             extracted = page.get_text().strip()
-            
-            if extracted:
-                text += extracted + "\n"
-            else:
-                # OCR fallback for scanned PDFs
-                pix = page.get_pixmap()
-                img_bytes = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_bytes))
-                ocr_text = pytesseract.image_to_string(img)
-                text += ocr_text + "\n"
-
-        return text
+            pages.append(extracted)
+
+            if not extracted:
+                scanned.append(page.number)
+
+        doc.close()
+
+        # OCR fallback for scanned pages, rendered and recognized in parallel
+        for page_number, ocr_text in zip(scanned, ocr_pdf_pages(filepath, scanned)):
+            pages[page_number] = ocr_text
+
+        # Reassemble in page order
+        text = ""
+        page_offsets = []
+        for page_text in pages:
+            page_offsets.append(len(text))
+            text += page_text + "\n"
+
+        if scanned and len(scanned) < len(pages):
+            method = "pdf_mixed"
+        elif scanned:
+            method = "pdf_ocr"
+        else:
+            method = "pdf_text"
+
+        return text, method, page_offsets
 
     # DOCX
     if filepath.lower().endswith(".docx"):
         document = docx.Document(filepath)
-        return "\n".join([para.text for para in document.paragraphs])
+        return "\n".join([para.text for para in document.paragraphs]), "docx", [0]
 
     # Images (JPG, PNG, TIFF)
     if filepath.lower().endswith((".png", ".jpg", ".jpeg", ".tiff")):
         img = Image.open(filepath)
-        return pytesseract.image_to_string(img)
+        return pytesseract.image_to_string(img), "image_ocr", [0]
 
     # TXT
     try:
         with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+            return f.read(), "plain", [0]
     except:
-        return ""
+        return "", "plain", [0]
+
+
+def extract_text_from_file(filepath: str):
+    return extract_text_with_meta(filepath)[0]
 
 
 import spacy
@@ -52,7 +78,19 @@ nlp = spacy.load("en_core_web_sm")
 
 def classify_document(text: str):
     text = text.lower()
+    return _classify_parsed(text, nlp(text))
+
 
+def classify_documents(texts, batch_size: int = 32):
+    """Batch version of ``classify_document`` using ``nlp.pipe``."""
+    lowered = [t.lower() for t in texts]
+    return [
+        _classify_parsed(text, doc)
+        for text, doc in zip(lowered, nlp.pipe(lowered, batch_size=batch_size))
+    ]
+
+
+def _classify_parsed(text: str, doc):
     categories = {
         "Administrative": 0,
         "Academics": 0,
@@ -81,7 +119,6 @@ def classify_document(text: str):
     {"label": "RESEARCH_TERM", "pattern": "methodology section"},
     {"label": "RESEARCH_TERM", "pattern": "research paper"}
     ]
-    doc = nlp(text)
 
     # --- NER SIGNALS ---
     for ent in doc.ents:
@@ -203,19 +240,31 @@ def classify_document(text: str):
 
 nlp = spacy.load("en_core_web_sm")
 
-def get_relevant_sentences(text: str, query: str, embedder, top_k=5):
-    if not text or not query:
+def split_sentences(text: str):
+    if not text:
         return []
 
     doc = nlp(text)
-    sentences = [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 20]
+    return _sentences(doc)
+
 
+def split_sentences_batch(texts, batch_size: int = 32):
+    """Batch version of ``split_sentences`` using ``nlp.pipe``."""
+    return [
+        _sentences(doc) if text else []
+        for text, doc in zip(texts, nlp.pipe((t or "" for t in texts), batch_size=batch_size))
+    ]
+
+
+def _sentences(doc):
+    return [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 20]
+
+
+def rank_sentences(sentences, sentence_embeddings, query_embedding, top_k=5):
     if not sentences:
         return []
 
-    sentence_embeddings = embedder.encode(sentences)
-    query_embedding = embedder.encode(query).reshape(1, -1)
-
+    query_embedding = np.asarray(query_embedding).reshape(1, -1)
     similarities = cosine_similarity(query_embedding, sentence_embeddings)[0]
 
     ranked = sorted(
@@ -0,0 +1,74 @@
+# Kept free of spaCy / model imports: this module is what the OCR worker
+# processes import, so it has to stay cheap to load.
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+import numpy as np
+import pytesseract
+from PIL import Image
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+OCR_BLANK_STDDEV = float(os.getenv("OCR_BLANK_STDDEV", "2.0"))  # pixel std-dev below this = blank page
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent runs model and job-queue threads
+            _pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def ocr_pdf_page(filepath: str, page_number: int, dpi: int = OCR_DPI):
+    """Render one PDF page in grayscale and OCR it. Blank pages return ""."""
+    with fitz.open(filepath) as doc:
+        pix = doc[page_number].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+
+    samples = np.frombuffer(pix.samples, dtype=np.uint8)
+    if samples.size == 0 or samples.std() < OCR_BLANK_STDDEV:
+        return ""
+
+    img = Image.frombytes("L", (pix.width, pix.height), pix.samples, "raw", "L", pix.stride)
+    return pytesseract.image_to_string(img)
+
+
+def _ocr_pdf_page_args(args):
+    return ocr_pdf_page(*args)
+
+
+def ocr_pdf_pages(filepath: str, page_numbers, dpi: int = OCR_DPI):
+    """
+    OCR several pages of one PDF concurrently.
+
+    Returns the texts in the same order as ``page_numbers``. Runs inline
+    when there is a single page or a single worker, to skip pool overhead.
+    """
+    page_numbers = list(page_numbers)
+    if not page_numbers:
+        return []
+
+    args = [(filepath, n, dpi) for n in page_numbers]
+
+    if len(page_numbers) == 1 or OCR_WORKERS <= 1:
+        return [_ocr_pdf_page_args(a) for a in args]
+
+    return list(_get_pool().map(_ocr_pdf_page_args, args))
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
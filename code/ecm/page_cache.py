@@ -0,0 +1,150 @@
+# Rendered page images (PNG) for the preview modal, cached on disk by
+# content key and evicted least-recently-used once over budget.
+import os
+import shutil
+import threading
+import uuid
+
+import fitz  # PyMuPDF
+
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "cache/pages")
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(1024 ** 3)))
+PAGE_DPI = int(os.getenv("PAGE_DPI", "110"))             # full page in the preview
+THUMBNAIL_DPI = int(os.getenv("THUMBNAIL_DPI", "36"))    # page strip / list thumbnails
+THUMBNAIL_PAGES = int(os.getenv("THUMBNAIL_PAGES", "5")) # thumbnails pre-rendered at ingestion
+
+RENDER_SIZES = {"page": PAGE_DPI, "thumb": THUMBNAIL_DPI}
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".tif", ".tiff")
+COUNT_FILE = "pages.txt"   # page count of the content, never evicted
+
+_lock = threading.Lock()
+_used_bytes = None   # lazily measured; re-measured on every eviction
+
+
+def can_render(filepath: str):
+    return filepath.lower().endswith((".pdf",) + IMAGE_EXTENSIONS)
+
+
+def _cache_path(key: str, page_number: int, size: str):
+    return os.path.join(PAGE_CACHE_DIR, key[:2], key, f"{size}_{page_number}.png")
+
+
+def _count_path(key: str):
+    return os.path.join(PAGE_CACHE_DIR, key[:2], key, COUNT_FILE)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.part"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def page_count(filepath: str, key: str):
+    """Number of pages, read once from the file and then kept beside its images."""
+    path = _count_path(key)
+    try:
+        with open(path) as f:
+            return int(f.read())
+    except (FileNotFoundError, ValueError):
+        pass
+
+    with fitz.open(filepath) as doc:
+        count = doc.page_count
+
+    _write_atomic(path, str(count).encode("ascii"))
+    return count
+
+
+def _render(filepath: str, page_number: int, dpi: int):
+    # PyMuPDF opens images as single-page documents too
+    with fitz.open(filepath) as doc:
+        if page_number < 0 or page_number >= doc.page_count:
+            raise IndexError(page_number)
+        return doc[page_number].get_pixmap(dpi=dpi, alpha=False).tobytes("png")
+
+
+def _scan():
+    entries = []
+    for folder, _, names in os.walk(PAGE_CACHE_DIR):
+        for name in names:
+            if name == COUNT_FILE:
+                continue
+            path = os.path.join(folder, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def _account(size: int):
+    global _used_bytes
+    with _lock:
+        if _used_bytes is None:
+            _used_bytes = sum(size for _, size, _ in _scan())
+        else:
+            _used_bytes += size
+        over = _used_bytes > PAGE_CACHE_MAX_BYTES
+
+    if over:
+        evict()
+
+
+def evict(target_ratio: float = 0.8):
+    """Delete least-recently-served images until under ``target_ratio`` of the budget."""
+    global _used_bytes
+    with _lock:
+        entries = sorted(_scan())
+        used = sum(size for _, size, _ in entries)
+        target = PAGE_CACHE_MAX_BYTES * target_ratio
+
+        for _, size, path in entries:
+            if used <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            used -= size
+
+        _used_bytes = used
+
+
+def get_page_image(filepath: str, key: str, page_number: int, size: str = "page"):
+    """
+    Return the path of the rendered PNG of ``page_number`` (0-based),
+    rendering and caching it first if needed. Raises IndexError for a
+    page outside the document.
+    """
+    path = _cache_path(key, page_number, size)
+
+    if os.path.exists(path):
+        try:
+            os.utime(path)   # mtime doubles as last-used time for eviction
+            return path
+        except FileNotFoundError:
+            pass             # evicted in between
+
+    data = _render(filepath, page_number, RENDER_SIZES[size])
+    _write_atomic(path, data)
+
+    _account(len(data))
+    return path
+
+
+def prerender(filepath: str, key: str):
+    """Render the first page and the leading thumbnails at ingestion time."""
+    if not can_render(filepath):
+        return
+
+    get_page_image(filepath, key, 0, "page")
+    for n in range(min(page_count(filepath, key), THUMBNAIL_PAGES)):
+        get_page_image(filepath, key, n, "thumb")
+
+
+def drop(key: str):
+    """Remove every cached image of one content key."""
+    shutil.rmtree(os.path.join(PAGE_CACHE_DIR, key[:2], key), ignore_errors=True)
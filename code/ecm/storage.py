@@ -0,0 +1,73 @@
+import hashlib
+import os
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, limit: int):
+        super().__init__(f"File exceeds the {limit // (1024 * 1024)} MB upload limit")
+        self.limit = limit
+
+
+async def save_upload(upload, dest_path: str, max_bytes: int, chunk_size: int = 1024 * 1024):
+    """
+    Stream an ``UploadFile`` to ``dest_path`` in fixed-size chunks.
+
+    The SHA-256 and byte count are computed in the same pass, so memory
+    use stays at one chunk regardless of file size. The data is written to
+    a ``.part`` file and only renamed into place once complete; going over
+    ``max_bytes`` removes the partial file and raises ``UploadTooLarge``.
+
+    Returns ``(sha256_hex, size_bytes)``.
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    tmp_path = f"{dest_path}.part"
+
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+
+                sha256.update(chunk)
+                f.write(chunk)
+
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return sha256.hexdigest(), size
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024):
+    """Return ``(sha256_hex, size_bytes)`` of a file already on disk."""
+    sha256 = hashlib.sha256()
+    size = 0
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            size += len(chunk)
+
+    return sha256.hexdigest(), size
+
+
+def blob_path(root: str, content_hash: str, filename: str):
+    """
+    Content-addressed location of a stored file:
+    ``<root>/blobs/<first two hex chars>/<hash><ext>``.
+
+    The extension is kept because text extraction dispatches on it.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    return os.path.join(root, "blobs", content_hash[:2], f"{content_hash}{ext}")
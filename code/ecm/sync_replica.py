@@ -0,0 +1,57 @@
+"""
+Local stand-in for replication between two SQLite files.
+
+    python sync_replica.py --primary sqlite:///ecm.db --replica sqlite:///ecm_replica.db
+
+(both default to DATABASE_URL / REPLICA_DATABASE_URL)
+
+Copies the primary database into the replica file every ``--interval``
+seconds with SQLite's online backup API, so the app's heartbeats reach the
+replica and read routing (lag check, read-your-writes, fallback to the
+primary) can be exercised without a MySQL replica. Stop the script or
+raise ``--interval`` past REPLICA_MAX_LAG to watch reads fall back to the
+primary (GET /admin/metrics shows the measured lag).
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+
+def sqlite_path(url: str):
+    if not url.startswith("sqlite:///"):
+        sys.exit(f"Not a SQLite URL: {url!r}")
+    return url[len("sqlite:///"):]
+
+
+def copy_database(primary: str, replica: str):
+    src = sqlite3.connect(primary)
+    dst = sqlite3.connect(replica)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--primary", default=os.getenv("DATABASE_URL", ""))
+    parser.add_argument("--replica", default=os.getenv("REPLICA_DATABASE_URL", ""))
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between copies")
+    parser.add_argument("--once", action="store_true", help="copy once and exit")
+    args = parser.parse_args()
+
+    primary, replica = sqlite_path(args.primary), sqlite_path(args.replica)
+
+    while True:
+        started = time.time()
+        copy_database(primary, replica)
+        if args.once:
+            break
+        time.sleep(max(args.interval - (time.time() - started), 0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Metadata paths must not pull content-sized columns.
+
+/documents/list and /documents/semantic-search only return metadata; the
+legacy embedding JSON, stored text and sentence vectors can each be
+megabytes per row. Every SELECT the endpoints issue is captured with a
+before_cursor_execute hook and checked for those columns.
+
+document_embeddings.vector is read by the vector index sync on purpose
+and is not checked here.
+"""
+import os
+import re
+import sys
+import time
+
+import pytest
+from sqlalchemy import event
+
+ECM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORBIDDEN_COLUMNS = [
+    "documents.embedding",
+    "document_texts.content",
+    "document_sentences.sentences",
+    "document_sentences.vectors",
+]
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("ecm")
+    os.makedirs(workdir / "uploads")
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'ecm.db'}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("REPLICA_DATABASE_URL", None)
+    os.environ["SEARCH_BACKEND"] = "exact"
+
+    # main mounts ./uploads and migrates the database on import
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    sys.path.insert(0, ECM_DIR)
+    try:
+        import main
+        yield main
+    finally:
+        os.chdir(cwd)
+        sys.path.remove(ECM_DIR)
+
+
+@pytest.fixture(scope="module")
+def seeded(app_module):
+    main = app_module
+    db = main.SessionLocal()
+    try:
+        db.add(main.User(email="admin@example.com", role="Admin", is_active=True))
+        db.add(main.User(email="viewer@example.com", role="Viewer", is_active=True))
+
+        text = "Annual budget report for the campus library. " * 200
+        document = main.Document(
+            filename="budget.pdf",
+            filepath=os.path.join("uploads", "budget.pdf"),
+            description="Library budget",
+            category="Finance",
+            year_approved=2024,
+            document_type="Public",
+            uploaded_by="admin@example.com",
+            content_hash="0" * 64,
+            file_size=len(text),
+            embedding=[0.1] * 384,   # legacy column, never needed for listing
+        )
+        db.add(document)
+        db.flush()
+
+        space = main.embedding_space
+        main.save_document_text(db, document, text, "plain", [0])
+        main.save_document_embedding(db, document, space.encode_document(text, document.filename))
+        main.build_document_sentences(db, document, text, space)
+        db.commit()
+    finally:
+        db.close()
+
+    return main
+
+
+@pytest.fixture
+def captured_selects(seeded):
+    main = seeded
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engines = [main.engine, main.async_engine.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", capture)
+
+
+def auth_headers(main, email):
+    token = main.jwt.encode({"sub": email, "exp": time.time() + 3600}, main.SECRET_KEY, algorithm=main.ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def assert_no_forbidden_columns(statements):
+    assert statements, "no SELECT was captured"
+    for statement in statements:
+        for column in FORBIDDEN_COLUMNS:
+            assert not re.search(rf"\b{re.escape(column)}\b", statement), (
+                f"{column} selected by:\n{statement}"
+            )
+
+
+@pytest.mark.parametrize("email", ["admin@example.com", "viewer@example.com"])
+def test_document_list_selects_metadata_only(seeded, captured_selects, email):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(seeded.app)
+    response = client.get("/documents/list", headers=auth_headers(seeded, email))
+
+    assert response.status_code == 200
+    assert [d["filename"] for d in response.json()] == ["budget.pdf"]
+    assert_no_forbidden_columns(captured_selects)
+
+
+@pytest.mark.parametrize("email", ["admin@example.com", "viewer@example.com"])
+def test_semantic_search_selects_metadata_only(seeded, captured_selects, email):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(seeded.app)
+    response = client.get(
+        "/documents/semantic-search",
+        params={"query": "library budget report", "category": "Finance"},
+        headers=auth_headers(seeded, email),
+    )
+
+    assert response.status_code == 200
+    assert [d["filename"] for d in response.json()] == ["budget.pdf"]
+    assert_no_forbidden_columns(captured_selects)
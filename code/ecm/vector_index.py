@@ -0,0 +1,530 @@
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+
+
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+
+def pack_embedding(vector, dtype: str = "float32"):
+    """
+    Pack a vector into raw bytes for BLOB storage.
+
+    Returns ``(blob, scale)``; ``scale`` is only set for the int8 mode,
+    where each vector is symmetrically quantized to ``round(v / scale)``.
+    """
+    v = np.asarray(vector, dtype=np.float32).reshape(-1)
+
+    if dtype == "int8":
+        scale = float(np.abs(v).max()) / 127.0 or 1.0
+        return np.round(v / scale).astype(np.int8).tobytes(), scale
+
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+    return v.astype(dtype).tobytes(), None
+
+
+def unpack_embedding(blob: bytes, dtype: str = "float32", scale: float | None = None):
+    """Inverse of ``pack_embedding``; always returns float32."""
+    v = np.frombuffer(blob, dtype=np.dtype(dtype))
+
+    if dtype == "int8":
+        return v.astype(np.float32) * np.float32(scale or 1.0)
+
+    return v.astype(np.float32)
+
+
+def normalize(vector):
+    """Return a float32 unit vector (zero vectors are returned unchanged)."""
+    v = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(v)
+    if norm == 0:
+        return v
+    return v / norm
+
+
+class VectorIndex:
+    """
+    Process-resident embedding matrix for semantic search.
+
+    Rows are stored pre-normalized as float32, so cosine similarity against
+    the whole corpus is a single matrix-vector product. Each row is mapped
+    to a document id; removals swap the last row into the freed slot so the
+    live rows always stay contiguous.
+
+    Each row also carries the filter ``attributes`` of its document (e.g.
+    RBAC level, category, year), stored as small integer codes into a
+    per-attribute vocabulary. A search's ``where`` predicates are
+    evaluated once per distinct value and applied as a numpy mask, so
+    filtering never needs a database round trip.
+    """
+
+    def __init__(self, dim: int, attributes=()):
+        self.dim = dim
+        self.attributes = tuple(attributes)
+        self._lock = threading.RLock()
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._rows = {}   # doc_id -> row number
+        self._size = 0
+        self._codes = {name: np.zeros(0, dtype=np.int32) for name in self.attributes}
+        self._vocab = {name: {} for name in self.attributes}   # value -> code
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    def ids(self):
+        """Set of document ids currently indexed."""
+        with self._lock:
+            return set(self._ids[:self._size].tolist())
+
+    def max_id(self):
+        """Highest document id currently indexed (0 when empty)."""
+        with self._lock:
+            return int(self._ids[:self._size].max()) if self._size else 0
+
+    def attribute_values(self, name: str):
+        """Distinct values of attribute ``name`` seen so far."""
+        with self._lock:
+            return set(self._vocab[name])
+
+    def build(self, doc_ids, vectors, attrs=None):
+        """Replace the whole index with the given ids/vectors (and per-row attribute dicts)."""
+        ids = np.asarray(list(doc_ids), dtype=np.int64)
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        attrs = list(attrs) if attrs is not None else [{}] * len(ids)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+
+        with self._lock:
+            self._matrix = np.ascontiguousarray(matrix)
+            self._ids = ids
+            self._rows = {int(doc_id): row for row, doc_id in enumerate(ids)}
+            self._size = len(ids)
+            self._vocab = {name: {} for name in self.attributes}
+            self._codes = {
+                name: np.asarray([self._code(name, a.get(name)) for a in attrs], dtype=np.int32)
+                for name in self.attributes
+            }
+
+    def add(self, doc_id: int, vector, attrs=None):
+        """Insert or replace the vector (and attribute dict) for one document."""
+        v = normalize(vector)
+        if v.shape[0] != self.dim:
+            raise ValueError(f"Expected {self.dim}-d vector, got {v.shape[0]}")
+
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                self._grow(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._rows[doc_id] = row
+                self._ids[row] = doc_id
+            self._matrix[row] = v
+            for name in self.attributes:
+                self._codes[name][row] = self._code(name, (attrs or {}).get(name))
+
+    def remove(self, doc_id: int):
+        """Drop a document from the index; unknown ids are ignored."""
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return
+
+            last = self._size - 1
+            if row != last:
+                moved_id = int(self._ids[last])
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+                for codes in self._codes.values():
+                    codes[row] = codes[last]
+            self._size = last
+
+    def search(self, query_vector, top_k: int, min_score: float = -1.0, where=None):
+        """
+        Return up to ``top_k`` ``(doc_id, score)`` pairs, best first.
+
+        ``where`` maps attribute names to predicates on a value; only rows
+        whose every listed attribute passes are scored (RBAC and metadata
+        filters).
+        """
+        q = normalize(query_vector)
+
+        with self._lock:
+            if self._size == 0 or top_k <= 0:
+                return []
+
+            ids = self._ids[:self._size]
+            scores = self._matrix[:self._size] @ q
+
+            if where:
+                scores = np.where(self._mask(where, slice(0, self._size)), scores, -np.inf)
+
+            candidates = np.flatnonzero(scores >= min_score)
+            if len(candidates) > top_k:
+                part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+                candidates = candidates[part]
+
+            order = candidates[np.argsort(-scores[candidates])]
+            return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def search_exact(self, query_vector, top_k: int, min_score: float = -1.0, where=None):
+        """Brute-force scan over every row, regardless of subclass."""
+        return VectorIndex.search(self, query_vector, top_k, min_score, where)
+
+    def _code(self, name: str, value):
+        vocab = self._vocab[name]
+        code = vocab.get(value)
+        if code is None:
+            code = vocab[value] = len(vocab)
+        return code
+
+    def _mask(self, where, rows):
+        """Boolean mask over ``rows`` (a slice or row array) for the ``where`` predicates."""
+        mask = None
+        for name, predicate in where.items():
+            allowed = [code for value, code in self._vocab[name].items() if predicate(value)]
+            passed = np.isin(self._codes[name][rows], np.asarray(allowed, dtype=np.int32))
+            mask = passed if mask is None else mask & passed
+        return mask
+
+    def _grow(self, needed: int):
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(needed, capacity * 2, 64)
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        ids = np.zeros(new_capacity, dtype=np.int64)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix = matrix
+        self._ids = ids
+
+        for name, codes in self._codes.items():
+            grown = np.zeros(new_capacity, dtype=np.int32)
+            grown[:self._size] = codes[:self._size]
+            self._codes[name] = grown
+
+
+class IVFIndex(VectorIndex):
+    """
+    Inverted-file (IVF-flat) approximate index on top of ``VectorIndex``.
+
+    Vectors are clustered with spherical k-means into ``nlist`` cells; a
+    query only scores the rows in its ``nprobe`` closest cells. Raising
+    ``nprobe`` trades latency for recall, ``nprobe == nlist`` is exact.
+    The full matrix is still held, so ``search_exact`` stays available for
+    comparing results.
+
+    Until enough vectors exist to train (``nlist * min_points_per_list``)
+    searches fall back to the exact scan. Training runs k-means on a
+    snapshot in a background thread and swaps the result in, so adds and
+    searches never wait on it.
+    """
+
+    def __init__(self, dim: int, attributes=(), nlist: int = 0, nprobe: int = 8,
+                 min_points_per_list: int = 39, train_iters: int = 10):
+        super().__init__(dim, attributes)
+        self.nlist = nlist              # 0 = pick from corpus size at train time
+        self.nprobe = nprobe
+        self.min_points_per_list = min_points_per_list
+        self.train_iters = train_iters
+
+        self._centroids = None          # (nlist, dim) unit vectors
+        self._assign = np.zeros(0, dtype=np.int32)   # row -> list
+        self._lists = []                # list -> set of rows
+        self._trained_size = 0
+        self._dirty = False
+
+        self._training = False          # a background training thread is running
+        self._touched = None            # rows changed since its snapshot
+        self._generation = 0            # bumped by build(); stale trainings are dropped
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    # --- mutations -------------------------------------------------------
+
+    def build(self, doc_ids, vectors, attrs=None):
+        with self._lock:
+            super().build(doc_ids, vectors, attrs)
+            self._assign = np.zeros(self._size, dtype=np.int32)
+            self._centroids = None
+            self._lists = []
+            self._generation += 1
+            self._maybe_train()
+            self._dirty = True
+
+    def add(self, doc_id: int, vector, attrs=None):
+        with self._lock:
+            existing = self._rows.get(doc_id)
+            if existing is not None and self.is_trained:
+                self._lists[self._assign[existing]].discard(existing)
+
+            super().add(doc_id, vector, attrs)
+            row = self._rows[doc_id]
+            if self._touched is not None:
+                self._touched.add(row)
+
+            if len(self._assign) < self._matrix.shape[0]:
+                assign = np.zeros(self._matrix.shape[0], dtype=np.int32)
+                assign[:len(self._assign)] = self._assign
+                self._assign = assign
+
+            if self.is_trained:
+                cell = int(np.argmax(self._centroids @ self._matrix[row]))
+                self._assign[row] = cell
+                self._lists[cell].add(row)
+                # Retrain once the corpus has drifted far past the sample
+                # the centroids were fitted on.
+                if self._size >= 4 * self._trained_size:
+                    self._start_training()
+            else:
+                self._maybe_train()
+
+            self._dirty = True
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                return
+
+            last = self._size - 1
+            if self._touched is not None:
+                self._touched.add(row)   # now holds the last row's vector
+            if self.is_trained:
+                self._lists[self._assign[row]].discard(row)
+                if row != last:
+                    moved_cell = self._assign[last]
+                    self._lists[moved_cell].discard(last)
+                    self._lists[moved_cell].add(row)
+                    self._assign[row] = moved_cell
+
+            super().remove(doc_id)
+            self._dirty = True
+
+    # --- search ----------------------------------------------------------
+
+    def search(self, query_vector, top_k: int, min_score: float = -1.0,
+               where=None, nprobe: int | None = None):
+        with self._lock:
+            if not self.is_trained:
+                return super().search(query_vector, top_k, min_score, where)
+
+            q = normalize(query_vector)
+            nprobe = min(nprobe or self.nprobe, len(self._centroids))
+
+            cell_scores = self._centroids @ q
+            cells = np.argpartition(-cell_scores, nprobe - 1)[:nprobe]
+
+            rows = np.fromiter(
+                (r for c in cells for r in self._lists[c]),
+                dtype=np.int64
+            )
+            if len(rows) == 0 or top_k <= 0:
+                return []
+
+            ids = self._ids[rows]
+            scores = self._matrix[rows] @ q
+
+            if where:
+                scores = np.where(self._mask(where, rows), scores, -np.inf)
+
+            candidates = np.flatnonzero(scores >= min_score)
+            if len(candidates) > top_k:
+                part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+                candidates = candidates[part]
+
+            order = candidates[np.argsort(-scores[candidates])]
+            return [(int(ids[i]), float(scores[i])) for i in order]
+
+    # --- training --------------------------------------------------------
+
+    def _maybe_train(self):
+        nlist = self.nlist or self._auto_nlist(self._size)
+        if self._size >= nlist * self.min_points_per_list:
+            self._start_training()
+
+    @staticmethod
+    def _auto_nlist(n):
+        return max(1, int(4 * np.sqrt(max(n, 1))))
+
+    def _start_training(self):
+        """Train on a snapshot of the live rows in a background thread (one at a time)."""
+        if self._training:
+            return
+
+        self._training = True
+        self._touched = set()
+        snapshot = self._matrix[:self._size].copy()
+        threading.Thread(
+            target=self._train, args=(snapshot, self._generation), daemon=True, name="ivf-train"
+        ).start()
+
+    def _train(self, matrix, generation: int):
+        retry = False
+        try:
+            centroids = self._fit_centroids(matrix)
+            assign = self._assign_rows(matrix, centroids)
+
+            with self._lock:
+                if generation == self._generation:
+                    self._install(centroids, assign)
+                else:
+                    retry = True   # rebuilt meanwhile; the snapshot is meaningless
+        except Exception as e:
+            print("IVF TRAINING FAILED:", e)
+        finally:
+            with self._lock:
+                self._training = False
+                self._touched = None
+                if retry:
+                    self._maybe_train()
+
+    def _fit_centroids(self, matrix):
+        """Spherical k-means over a sample of ``matrix``."""
+        size = len(matrix)
+        nlist = self.nlist or self._auto_nlist(size)
+        nlist = min(nlist, size)
+        rng = np.random.default_rng(0)
+
+        sample_size = min(size, nlist * 256)
+        sample = matrix[rng.choice(size, sample_size, replace=False)]
+
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.train_iters):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        return centroids
+
+    def _install(self, centroids, assign):
+        """
+        Swap in trained centroids (caller holds the lock). ``assign`` covers
+        the snapshot; rows changed or appended since are assigned here.
+        """
+        size = self._size
+        known = min(len(assign), size)
+
+        full = np.zeros(self._matrix.shape[0], dtype=np.int32)
+        full[:known] = assign[:known]
+
+        stale = np.asarray(
+            sorted({r for r in self._touched if r < known} | set(range(known, size))),
+            dtype=np.int64
+        )
+        if len(stale):
+            full[stale] = self._assign_rows(self._matrix[stale], centroids)
+
+        self._centroids = centroids
+        self._assign = full
+        self._lists = [set() for _ in range(len(centroids))]
+        for row, cell in enumerate(full[:size]):
+            self._lists[cell].add(row)
+        self._trained_size = size
+        self._dirty = True
+
+    @staticmethod
+    def _assign_rows(matrix, centroids, chunk: int = 8192):
+        out = np.empty(len(matrix), dtype=np.int32)
+        for start in range(0, len(matrix), chunk):
+            block = matrix[start:start + chunk]
+            out[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+        return out
+
+    # --- persistence -----------------------------------------------------
+
+    def save(self, path: str):
+        """Write the index atomically to ``path`` (an ``.npz`` file)."""
+        with self._lock:
+            payload = {
+                "dim": np.int64(self.dim),
+                "ids": self._ids[:self._size].copy(),
+                "matrix": self._matrix[:self._size].copy(),
+                "trained_size": np.int64(self._trained_size),
+                # Vocabularies as JSON: np.load refuses object arrays by default
+                "attributes": np.array(json.dumps({
+                    name: list(self._vocab[name]) for name in self.attributes
+                })),
+            }
+            for name in self.attributes:
+                payload[f"codes_{name}"] = self._codes[name][:self._size].copy()
+            if self.is_trained:
+                payload["centroids"] = self._centroids.copy()
+                payload["assign"] = self._assign[:self._size].copy()
+            self._dirty = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Every worker saves the same path; a shared tmp name would interleave
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **payload)
+        os.replace(tmp_path, path)
+
+    def save_if_dirty(self, path: str):
+        if self._dirty:
+            self.save(path)
+
+    @classmethod
+    def load(cls, path: str, dim: int, **kwargs):
+        """
+        Load an index saved by ``save``. Returns ``None`` when the file is
+        missing or was built for a different embedding dimension or set of
+        attributes.
+        """
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path) as data:
+            if int(data["dim"]) != dim:
+                return None
+
+            index = cls(dim, **kwargs)
+            vocab = json.loads(str(data["attributes"])) if "attributes" in data else {}
+            if set(vocab) != set(index.attributes):
+                return None
+            ids = data["ids"]
+            matrix = data["matrix"]
+
+            index._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            index._ids = ids.astype(np.int64)
+            index._rows = {int(doc_id): row for row, doc_id in enumerate(ids)}
+            index._size = len(ids)
+            index._assign = np.zeros(index._size, dtype=np.int32)
+            for name in index.attributes:
+                index._vocab[name] = {value: code for code, value in enumerate(vocab[name])}
+                index._codes[name] = data[f"codes_{name}"].astype(np.int32)
+
+            if "centroids" in data:
+                index._centroids = data["centroids"].astype(np.float32)
+                index._assign = data["assign"].astype(np.int32)
+                index._lists = [set() for _ in range(len(index._centroids))]
+                for row, cell in enumerate(index._assign):
+                    index._lists[cell].add(row)
+                index._trained_size = int(data["trained_size"])
+
+        return index
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+class PoolBusy(Exception):
+    def __init__(self, timeout: float):
+        super().__init__(f"No worker became free within {timeout:g}s")
+        self.timeout = timeout
+
+
+class BoundedPool:
+    """
+    Runs blocking calls from async handlers on a fixed set of worker
+    threads, so they never stall the event loop.
+
+    At most ``workers`` calls run at once. Callers wait their turn for up
+    to ``queue_timeout`` seconds and then get ``PoolBusy`` instead of piling
+    up behind a burst. Meant for C code that releases the GIL (Argon2).
+    """
+
+    def __init__(self, workers: int, queue_timeout: float, name: str = "pool"):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._semaphore = asyncio.Semaphore(workers)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn, *args, **kwargs):
+        with self._lock:
+            self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._rejected += 1
+            raise PoolBusy(self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        with self._lock:
+            self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        finally:
+            self._semaphore.release()
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_timeout": self.queue_timeout,
+                "running": self._running,
+                "waiting": self._waiting,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }